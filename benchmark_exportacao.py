@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+⏱️ Benchmark de Exportação
+==========================
+
+Compara tamanho, vazão e pico de memória dos modos de exportação de
+`salvar_csv_coordenadas`/`salvar_geojson` com os escritores originais,
+usando os dados de roubo de celular de 2020 do minicurso.
+
+Entradas:
+    A: camada completa (14.668 pontos, 57 atributos + geometria), na ordem
+        da planilha.
+    B: colunas CIDADE/BAIRRO/QUANT_CELULAR repetidas 10x (146.680 pontos).
+    C: entrada B ordenada pela curva de Hilbert.
+
+Uso:
+    python benchmark_exportacao.py [diretorio_saida]
+"""
+
+import sys
+import tempfile
+
+def benchmark_exportacao(diretorio, precisao=6, repeticoes=3):
+    """Executa `comparar_exportacoes` nas entradas A, B e C."""
+    import pandas as pd
+    import geopandas_tutorial as tutorial
+    
+    camadas, _ = tutorial.carregar_camadas(
+        {'roubos_celular_sp': tutorial.CAMADAS_MINICURSO['roubos_celular_sp']}
+    )
+    roubos = camadas['roubos_celular_sp'].reset_index(drop=True)
+    
+    subconjunto = pd.concat(
+        [roubos[['CIDADE', 'BAIRRO', 'QUANT_CELULAR', 'geometry']]] * 10,
+        ignore_index=True,
+    )
+    entradas = {
+        'A: camada completa': roubos,
+        'B: 3 colunas x10': subconjunto,
+        'C: B ordenada por Hilbert': tutorial.ordenar_espacialmente(subconjunto),
+    }
+    
+    for nome, gdf in entradas.items():
+        print(f"\n📊 {nome} ({len(gdf)} pontos, {len(gdf.columns)} colunas)")
+        print(tutorial.comparar_exportacoes(
+            gdf, diretorio, precisao=precisao, repeticoes=repeticoes
+        ).round(2))
+
+if __name__ == "__main__":
+    import pandas as pd
+    
+    pd.set_option('display.width', 200)
+    if len(sys.argv) > 1:
+        benchmark_exportacao(sys.argv[1])
+    else:
+        with tempfile.TemporaryDirectory() as diretorio:
+            benchmark_exportacao(diretorio)
@@ -15,6 +15,9 @@ Data: 2024
 # IMPORTAÇÕES E CONFIGURAÇÕES
 # =============================================================================
 
+import time
+from pathlib import Path
+
 def instalar_dependencias():
     """Instala e verifica as dependências necessárias."""
     try:
@@ -43,12 +46,168 @@ def importar_bibliotecas():
     plt.rcParams['figure.figsize'] = (12, 8)
     plt.rcParams['font.size'] = 10
     
-    # Configurações do GeoPandas
-    gpd.options.use_pygeos = False
-    
     print("✅ Bibliotecas importadas com sucesso!")
     return gpd, pd, np, plt
 
+# =============================================================================
+# CARREGAMENTO CONCORRENTE DE CAMADAS
+# =============================================================================
+
+DIRETORIO_DADOS = Path(__file__).resolve().parent / 'minicurso-geopandas' / 'dados'
+
+# Camadas usadas no minicurso; cada entrada aceita 'caminho' e, para
+# planilhas, as colunas de coordenadas 'x'/'y' e o 'crs' dos pontos.
+# Camadas com 'opcional': True que falharem aparecem só no relatório.
+# Demais chaves são repassadas para a função de leitura.
+CAMADAS_MINICURSO = {
+    'capital_sp': {'caminho': DIRETORIO_DADOS / 'capital_são_paulo.json'},
+    'municipios_grande_sp': {'caminho': DIRETORIO_DADOS / 'municipios_grande_sp.json'},
+    # O .shp não acompanha o repositório (apenas .dbf/.shx/.prj/.cpg)
+    'municipios_sp_2019': {
+        'caminho': DIRETORIO_DADOS / 'SP_Municipios_2019.shp',
+        'opcional': True,
+    },
+    'roubos_celular_sp': {
+        'caminho': DIRETORIO_DADOS / 'dados_roubo_celular_sp_2020.xlsx',
+        'x': 'LONGITUDE',
+        'y': 'LATITUDE',
+        'crs': 'EPSG:4326',
+    },
+}
+
+def carregar_camada(caminho, x=None, y=None, crs=None, **kwargs):
+    """Carrega uma camada vetorial ou uma planilha com colunas de coordenadas.
+    
+    Arquivos .xlsx/.xls/.csv são lidos com pandas e convertidos em pontos a
+    partir das colunas `x` e `y` (linhas sem coordenadas são descartadas);
+    os demais formatos são lidos com `gpd.read_file`.
+    """
+    import geopandas as gpd
+    import pandas as pd
+    
+    caminho = Path(caminho)
+    sufixo = caminho.suffix.lower()
+    
+    if sufixo not in ('.xlsx', '.xls', '.csv'):
+        return gpd.read_file(caminho, **kwargs)
+    
+    if x is None or y is None:
+        raise ValueError(f"Informe as colunas de coordenadas 'x' e 'y' para {caminho.name}")
+    
+    if sufixo == '.csv':
+        df = pd.read_csv(caminho, **kwargs)
+    else:
+        df = pd.read_excel(caminho, **kwargs)
+    
+    df = df.dropna(subset=[x, y])
+    return gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df[x], df[y]), crs=crs)
+
+def _carregar_cronometrado(nome, especificacao):
+    """Carrega uma camada medindo o tempo; erros são devolvidos, não lançados."""
+    especificacao = {chave: valor for chave, valor in especificacao.items() if chave != 'opcional'}
+    inicio = time.perf_counter()
+    try:
+        gdf, erro = carregar_camada(**especificacao), None
+    except Exception as e:
+        gdf, erro = None, f"{type(e).__name__}: {e}"
+    return nome, gdf, time.perf_counter() - inicio, erro
+
+def _montar_relatorio(manifesto, resultados, ignorar_erros):
+    """Separa as camadas carregadas do relatório de tempos por camada."""
+    import pandas as pd
+    
+    falhas = [
+        (nome, erro) for nome, _, _, erro in resultados
+        if erro is not None and not manifesto[nome].get('opcional', False)
+    ]
+    if falhas and not ignorar_erros:
+        detalhes = '; '.join(f"{nome}: {erro}" for nome, erro in falhas)
+        raise RuntimeError(f"Falha ao carregar camadas: {detalhes}")
+    
+    camadas = {nome: gdf for nome, gdf, _, erro in resultados if erro is None}
+    relatorio = pd.DataFrame(
+        [
+            {
+                'camada': nome,
+                'segundos': segundos,
+                'linhas': len(gdf) if gdf is not None else 0,
+                'opcional': manifesto[nome].get('opcional', False),
+                'erro': erro,
+            }
+            for nome, gdf, segundos, erro in resultados
+        ],
+        columns=['camada', 'segundos', 'linhas', 'opcional', 'erro'],
+    ).set_index('camada')
+    return camadas, relatorio
+
+def carregar_camadas(manifesto, executor='threads', max_workers=None, ignorar_erros=False):
+    """Carrega concorrentemente todas as camadas de um manifesto.
+    
+    A leitura via GDAL libera o GIL, então threads bastam para arquivos
+    vetoriais; para planilhas grandes (openpyxl é Python puro) use
+    `executor='processos'`. O tempo total tende ao da camada mais lenta.
+    
+    Args:
+        manifesto: Dicionário {nome: especificação}, no formato de `CAMADAS_MINICURSO`.
+        executor: 'threads' ou 'processos'.
+        max_workers: Número máximo de workers (padrão: uma por camada).
+        ignorar_erros: Se True, qualquer camada com falha fica só no relatório;
+            por padrão isso vale apenas para as marcadas como 'opcional'.
+    
+    Returns:
+        Tupla (camadas, relatorio): dicionário de GeoDataFrames e DataFrame
+        com tempo em segundos, número de linhas e erro de cada camada.
+    """
+    from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+    
+    executores = {'threads': ThreadPoolExecutor, 'processos': ProcessPoolExecutor}
+    if executor not in executores:
+        raise ValueError(f"Executor desconhecido: {executor!r} (use 'threads' ou 'processos')")
+    
+    with executores[executor](max_workers=max_workers or max(len(manifesto), 1)) as pool:
+        futuros = [
+            pool.submit(_carregar_cronometrado, nome, especificacao)
+            for nome, especificacao in manifesto.items()
+        ]
+        resultados = [futuro.result() for futuro in futuros]
+    
+    return _montar_relatorio(manifesto, resultados, ignorar_erros)
+
+async def carregar_camadas_async(manifesto, executor=None, ignorar_erros=False):
+    """Versão asyncio de `carregar_camadas`, para uso em notebooks e serviços.
+    
+    Cada camada é lida em `executor` (padrão: thread pool do event loop),
+    sem bloquear o loop enquanto as leituras acontecem.
+    """
+    import asyncio
+    
+    loop = asyncio.get_running_loop()
+    resultados = await asyncio.gather(*[
+        loop.run_in_executor(executor, _carregar_cronometrado, nome, especificacao)
+        for nome, especificacao in manifesto.items()
+    ])
+    
+    return _montar_relatorio(manifesto, resultados, ignorar_erros)
+
+def exibir_tempos_carregamento(relatorio, segundos_total):
+    """Exibe o tempo de cada camada em comparação com o tempo total."""
+    import pandas as pd
+    
+    print("⏱️ TEMPOS DE CARREGAMENTO:")
+    print("=" * 30)
+    
+    for camada, linha in relatorio.iterrows():
+        if pd.isna(linha['erro']):
+            print(f"  ✅ {camada}: {linha['segundos']:.2f} s ({linha['linhas']} linhas)")
+        elif linha['opcional']:
+            print(f"  ⚠️ {camada} (opcional): {linha['erro']}")
+        else:
+            print(f"  ❌ {camada}: {linha['erro']}")
+    
+    print(f"\nTotal: {segundos_total:.2f} s | "
+          f"Soma sequencial: {relatorio['segundos'].sum():.2f} s | "
+          f"Camada mais lenta: {relatorio['segundos'].max() if len(relatorio) else 0.0:.2f} s")
+
 # =============================================================================
 # CRIAÇÃO DE DADOS DE EXEMPLO
 # =============================================================================
@@ -102,9 +261,297 @@ def analisar_dados(gdf):
     print(f"\nTipos de dados:")
     print(gdf.dtypes)
     
-    # Estatísticas descritivas
+    # Estatísticas descritivas (uma única passada, sem describe())
+    acumulador = AcumuladorEstatisticas().atualizar(gdf)
     print(f"\nEstatísticas descritivas:")
-    print(gdf.describe())
+    print(acumulador.resumo())
+    print(f"\nLimites da geometria: {acumulador.limites}")
+
+# =============================================================================
+# ESTATÍSTICAS EM FLUXO
+# =============================================================================
+
+class _SketchQuantis:
+    """Resumo compacto e mesclável de uma distribuição para estimar quantis.
+    
+    Guarda no máximo `tamanho` centróides (valor médio, peso). Quando o
+    limite é ultrapassado, centróides vizinhos são agrupados em faixas de
+    peso igual, como em uma t-digest simplificada.
+    """
+    
+    def __init__(self, tamanho=200):
+        import numpy as np
+        
+        self.tamanho = tamanho
+        self.valores = np.empty(0)
+        self.pesos = np.empty(0)
+    
+    def _incorporar(self, valores, pesos):
+        import numpy as np
+        
+        valores = np.concatenate([self.valores, valores])
+        pesos = np.concatenate([self.pesos, pesos])
+        ordem = np.argsort(valores, kind='stable')
+        valores, pesos = valores[ordem], pesos[ordem]
+        
+        if len(valores) > self.tamanho:
+            # Agrupando os centróides em faixas de mesmo peso acumulado
+            acumulado = np.cumsum(pesos)
+            faixa = np.minimum(
+                (acumulado - pesos / 2) / acumulado[-1] * self.tamanho,
+                self.tamanho - 1,
+            ).astype(np.int64)
+            novos_pesos = np.bincount(faixa, weights=pesos, minlength=self.tamanho)
+            somas = np.bincount(faixa, weights=valores * pesos, minlength=self.tamanho)
+            ocupadas = novos_pesos > 0
+            valores = somas[ocupadas] / novos_pesos[ocupadas]
+            pesos = novos_pesos[ocupadas]
+        
+        self.valores, self.pesos = valores, pesos
+    
+    def adicionar(self, valores):
+        """Incorpora um bloco de observações (NaN já removidos)."""
+        import numpy as np
+        
+        valores = np.asarray(valores, dtype=float)
+        self._incorporar(valores, np.ones(len(valores)))
+    
+    def mesclar(self, outro):
+        """Incorpora outro sketch, vindo de outra partição ou worker."""
+        self._incorporar(outro.valores, outro.pesos)
+    
+    def quantil(self, q):
+        """Estima o quantil `q` (entre 0 e 1) por interpolação linear."""
+        import numpy as np
+        
+        if len(self.valores) == 0:
+            return np.nan
+        if len(self.valores) == 1:
+            return float(self.valores[0])
+        if (self.pesos == 1).all():
+            # Sem compressão o resultado é exato, como em `Series.quantile`
+            posicoes = np.arange(len(self.valores)) / (len(self.valores) - 1)
+        else:
+            posicoes = (np.cumsum(self.pesos) - self.pesos / 2) / self.pesos.sum()
+        return float(np.interp(q, posicoes, self.valores))
+
+class AcumuladorEstatisticas:
+    """Calcula estatísticas descritivas em uma única passada sobre blocos.
+    
+    Cada chamada a `atualizar` consome um bloco (GeoDataFrame ou DataFrame)
+    e atualiza contagem, soma, média e M2 (soma dos quadrados dos desvios,
+    combinada pelo método de Chan), mínimo, máximo e sketch de quantis de cada
+    coluna numérica, os agregados por grupo e os limites totais da geometria.
+    Acumuladores parciais, calculados sobre partições diferentes, podem ser
+    combinados com `mesclar` sem materializar o conjunto completo.
+    
+    Exemplo:
+        acumulador = AcumuladorEstatisticas(por='regiao')
+        for bloco in ler_blocos('dados.geojson'):
+            acumulador.atualizar(bloco)
+        print(acumulador.resumo())
+    """
+    
+    QUANTIS = (0.25, 0.5, 0.75)
+    
+    def __init__(self, colunas=None, por=None, tamanho_sketch=200):
+        import numpy as np
+        
+        self.colunas = list(colunas) if colunas is not None else None
+        # Chaves de agrupamento sempre como lista (uma ou mais colunas)
+        if por is None or isinstance(por, list):
+            self.por = por
+        elif isinstance(por, tuple):
+            self.por = list(por)
+        else:
+            self.por = [por]
+        self.tamanho_sketch = tamanho_sketch
+        self.linhas = 0
+        self.contagem = {}
+        self.soma = {}
+        self.media = {}
+        self.m2 = {}
+        self.minimo = {}
+        self.maximo = {}
+        self.sketches = {}
+        self.grupos = None
+        self.limites = np.array([np.inf, np.inf, -np.inf, -np.inf])
+    
+    def _colunas_numericas(self, bloco):
+        if self.colunas is not None:
+            return self.colunas
+        numericas = bloco.select_dtypes(include='number').columns
+        return [coluna for coluna in numericas if coluna not in (self.por or [])]
+    
+    def _iniciar_coluna(self, coluna):
+        import numpy as np
+        
+        if coluna in self.sketches:
+            return
+        self.contagem[coluna] = 0
+        self.soma[coluna] = 0.0
+        self.media[coluna] = 0.0
+        self.m2[coluna] = 0.0
+        self.minimo[coluna] = np.inf
+        self.maximo[coluna] = -np.inf
+        self.sketches[coluna] = _SketchQuantis(self.tamanho_sketch)
+    
+    def _combinar_momentos(self, coluna, contagem, media, m2):
+        """Combina contagem, média e M2 parciais (Chan et al.)."""
+        if contagem == 0:
+            return
+        total = self.contagem[coluna] + contagem
+        delta = media - self.media[coluna]
+        self.media[coluna] += delta * contagem / total
+        self.m2[coluna] += m2 + delta ** 2 * self.contagem[coluna] * contagem / total
+        self.contagem[coluna] = total
+    
+    def atualizar(self, bloco):
+        """Incorpora um bloco de linhas às estatísticas acumuladas."""
+        import numpy as np
+        import pandas as pd
+        
+        self.linhas += len(bloco)
+        colunas = self._colunas_numericas(bloco)
+        
+        for coluna in colunas:
+            valores = bloco[coluna].to_numpy(dtype=float, na_value=np.nan)
+            valores = valores[~np.isnan(valores)]
+            self._iniciar_coluna(coluna)
+            if len(valores) == 0:
+                continue
+            media = valores.mean()
+            self._combinar_momentos(coluna, len(valores), media, ((valores - media) ** 2).sum())
+            self.soma[coluna] += valores.sum()
+            self.minimo[coluna] = min(self.minimo[coluna], valores.min())
+            self.maximo[coluna] = max(self.maximo[coluna], valores.max())
+            self.sketches[coluna].adicionar(valores)
+        
+        if self.por is not None:
+            agrupado = bloco.groupby(self.por)
+            parcial = pd.concat({
+                'linhas': agrupado.size(),
+                **{(coluna, estatistica): agrupado[coluna].agg(estatistica)
+                   for coluna in colunas
+                   for estatistica in ('count', 'sum', 'min', 'max')},
+            }, axis=1)
+            self._mesclar_grupos(parcial)
+        
+        if hasattr(bloco, 'geometry') and len(bloco) > 0:
+            xmin, ymin, xmax, ymax = bloco.geometry.total_bounds
+            self.limites = np.array([
+                np.fmin(self.limites[0], xmin),
+                np.fmin(self.limites[1], ymin),
+                np.fmax(self.limites[2], xmax),
+                np.fmax(self.limites[3], ymax),
+            ])
+        
+        return self
+    
+    def _mesclar_grupos(self, parcial):
+        import pandas as pd
+        
+        if self.grupos is None:
+            self.grupos = parcial
+            return
+        
+        niveis = list(range(self.grupos.index.nlevels))
+        combinado = pd.concat([self.grupos, parcial]).groupby(level=niveis)
+        funcoes = {
+            coluna: 'sum' if coluna == 'linhas' or coluna[1] in ('count', 'sum') else coluna[1]
+            for coluna in combinado.obj.columns
+        }
+        self.grupos = combinado.agg(funcoes)
+    
+    def mesclar(self, outro):
+        """Combina as estatísticas de outro acumulador com as deste."""
+        import numpy as np
+        
+        self.linhas += outro.linhas
+        for coluna, sketch in outro.sketches.items():
+            self._iniciar_coluna(coluna)
+            self._combinar_momentos(
+                coluna, outro.contagem[coluna], outro.media[coluna], outro.m2[coluna]
+            )
+            self.soma[coluna] += outro.soma[coluna]
+            self.minimo[coluna] = min(self.minimo[coluna], outro.minimo[coluna])
+            self.maximo[coluna] = max(self.maximo[coluna], outro.maximo[coluna])
+            self.sketches[coluna].mesclar(sketch)
+        
+        if outro.grupos is not None:
+            self._mesclar_grupos(outro.grupos)
+        
+        self.limites = np.concatenate([
+            np.fmin(self.limites[:2], outro.limites[:2]),
+            np.fmax(self.limites[2:], outro.limites[2:]),
+        ])
+        return self
+    
+    def resumo(self):
+        """Retorna as estatísticas no mesmo formato de `DataFrame.describe()`."""
+        import numpy as np
+        import pandas as pd
+        
+        resumo = {}
+        for coluna, sketch in self.sketches.items():
+            contagem = self.contagem[coluna]
+            vazio = contagem == 0
+            resumo[coluna] = {
+                'count': contagem,
+                'mean': np.nan if vazio else self.media[coluna],
+                'std': np.sqrt(self.m2[coluna] / (contagem - 1)) if contagem > 1 else np.nan,
+                'min': np.nan if vazio else self.minimo[coluna],
+                **{f'{q:.0%}': sketch.quantil(q) for q in self.QUANTIS},
+                'max': np.nan if vazio else self.maximo[coluna],
+                'sum': self.soma[coluna],
+            }
+        return pd.DataFrame(resumo)
+    
+    def resumo_por_grupo(self):
+        """Retorna contagem, soma, média, mínimo e máximo por grupo."""
+        import pandas as pd
+        
+        if self.grupos is None:
+            raise ValueError("O acumulador não foi criado com o parâmetro `por`")
+        
+        resultado = {'linhas': self.grupos['linhas']}
+        for coluna in self.sketches:
+            contagem = self.grupos[(coluna, 'count')]
+            resultado[(coluna, 'count')] = contagem
+            resultado[(coluna, 'sum')] = self.grupos[(coluna, 'sum')]
+            resultado[(coluna, 'mean')] = self.grupos[(coluna, 'sum')] / contagem.where(contagem > 0)
+            resultado[(coluna, 'min')] = self.grupos[(coluna, 'min')]
+            resultado[(coluna, 'max')] = self.grupos[(coluna, 'max')]
+        return pd.DataFrame(resultado)
+
+def ler_blocos(caminho, linhas_por_bloco=50000, **kwargs):
+    """Lê um arquivo vetorial em blocos de `linhas_por_bloco` linhas.
+    
+    A fonte é aberta uma única vez e percorrida como um stream Arrow, então
+    o custo total é o de uma leitura completa do arquivo.
+    """
+    import geopandas as gpd
+    import pandas as pd
+    from pyogrio import open_arrow
+    
+    inicio = 0
+    with open_arrow(caminho, batch_size=linhas_por_bloco, use_pyarrow=True, **kwargs) as (meta, leitor):
+        coluna_geometria = meta['geometry_name'] or 'wkb_geometry'
+        for lote in leitor:
+            if lote.num_rows == 0:
+                continue
+            atributos = lote.drop_columns([coluna_geometria]).to_pandas()
+            atributos.index = pd.RangeIndex(inicio, inicio + lote.num_rows)
+            inicio += lote.num_rows
+            geometria = gpd.GeoSeries.from_wkb(lote.column(coluna_geometria).to_numpy(zero_copy_only=False))
+            yield gpd.GeoDataFrame(atributos, geometry=geometria.to_numpy(), crs=meta['crs'])
+
+def estatisticas_em_fluxo(blocos, por=None, colunas=None):
+    """Consome um iterável de blocos e retorna o acumulador preenchido."""
+    acumulador = AcumuladorEstatisticas(colunas=colunas, por=por)
+    for bloco in blocos:
+        acumulador.atualizar(bloco)
+    return acumulador
 
 # =============================================================================
 # VISUALIZAÇÕES
@@ -232,10 +679,10 @@ def operacoes_espaciais(gdf):
     print("\n📊 ESTATÍSTICAS POR REGIÃO:")
     print("=" * 30)
     
-    estatisticas_regiao = gdf.groupby('regiao').agg({
-        'populacao': ['count', 'sum', 'mean'],
-        'cidade': 'count'
-    }).round(2)
+    acumulador = AcumuladorEstatisticas(colunas=['populacao'], por='regiao').atualizar(gdf)
+    estatisticas_regiao = acumulador.resumo_por_grupo()[[
+        'linhas', ('populacao', 'sum'), ('populacao', 'mean')
+    ]].round(2)
     
     estatisticas_regiao.columns = ['Número de Cidades', 'População Total', 'População Média']
     print(estatisticas_regiao)
@@ -299,34 +746,324 @@ def visualizar_areas_influencia(gdf, areas_influencia):
     plt.tight_layout()
     return fig, ax
 
+# =============================================================================
+# ORDENAÇÃO ESPACIAL
+# =============================================================================
+
+def _espalhar_bits(valores):
+    """Intercala zeros entre os bits de inteiros de até 32 bits."""
+    import numpy as np
+    
+    v = valores.astype(np.uint64)
+    v = (v | (v << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x3333333333333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x5555555555555555)
+    return v
+
+def _indice_morton(geometria, nivel):
+    """Calcula o índice Z-order (Morton) do centro do bbox de cada geometria."""
+    import numpy as np
+    
+    limites = geometria.bounds.to_numpy()
+    x = (limites[:, 0] + limites[:, 2]) / 2
+    y = (limites[:, 1] + limites[:, 3]) / 2
+    
+    # Normalizando as coordenadas para a grade de 2^nivel células por eixo
+    xmin, ymin, xmax, ymax = geometria.total_bounds
+    escala = 2 ** nivel - 1
+    xi = (x - xmin) / max(xmax - xmin, 1e-12) * escala
+    yi = (y - ymin) / max(ymax - ymin, 1e-12) * escala
+    
+    return _espalhar_bits(xi.astype(np.uint64)) | (_espalhar_bits(yi.astype(np.uint64)) << np.uint64(1))
+
+def ordenar_espacialmente(gdf, metodo='hilbert', nivel=16, erro_se_vazia=False):
+    """Ordena as linhas segundo uma curva de preenchimento do espaço.
+    
+    Linhas próximas no espaço passam a ficar próximas na tabela, o que reduz
+    a sobreposição dos bounding boxes dos row groups no Parquet e melhora a
+    localidade de cache em junções espaciais (`gpd.sjoin`).
+    
+    Args:
+        gdf: GeoDataFrame de entrada.
+        metodo: 'hilbert' (melhor localidade) ou 'zorder' (Morton, mais barato).
+        nivel: Número de bits por eixo da grade, entre 1 e 16.
+        erro_se_vazia: Se True, lança ValueError quando houver geometrias
+            vazias ou ausentes; por padrão elas vão para o final.
+    
+    Returns:
+        Novo GeoDataFrame ordenado; o índice original é preservado.
+    """
+    import numpy as np
+    
+    if not 1 <= nivel <= 16:
+        raise ValueError(f"nivel deve estar entre 1 e 16, recebido: {nivel}")
+    if metodo not in ('hilbert', 'zorder'):
+        raise ValueError(f"Método de ordenação desconhecido: {metodo!r} (use 'hilbert' ou 'zorder')")
+    
+    geometria = gdf.geometry
+    validas = ~(geometria.isna() | geometria.is_empty).to_numpy()
+    if erro_se_vazia and not validas.all():
+        raise ValueError("Não é possível ordenar geometrias vazias ou ausentes")
+    
+    # Geometrias vazias ou ausentes recebem uma chave maior que qualquer outra
+    chave = np.full(len(gdf), np.iinfo(np.uint64).max, dtype=np.uint64)
+    if validas.any():
+        if metodo == 'hilbert':
+            chave[validas] = geometria[validas].hilbert_distance(level=nivel).to_numpy()
+        else:
+            chave[validas] = _indice_morton(geometria[validas], nivel)
+    
+    return gdf.iloc[np.argsort(chave, kind='stable')]
+
+def salvar_parquet_espacial(gdf, caminho, metodo='hilbert', linhas_por_grupo=65536):
+    """Salva em GeoParquet ordenado espacialmente e com bbox por row group.
+    
+    A coluna de cobertura `bbox` (GeoParquet 1.1) faz o pyarrow gravar
+    estatísticas mínimo/máximo de xmin/ymin/xmax/ymax em cada row group,
+    permitindo que leituras com filtro espacial pulem grupos irrelevantes.
+    """
+    gdf_ordenado = ordenar_espacialmente(gdf, metodo=metodo)
+    gdf_ordenado.to_parquet(caminho, write_covering_bbox=True, row_group_size=linhas_por_grupo)
+    return gdf_ordenado
+
+def ler_parquet_espacial(caminho, bbox):
+    """Lê apenas as linhas que intersectam `bbox` (xmin, ymin, xmax, ymax).
+    
+    Os row groups cujas estatísticas de bbox não intersectam a janela nem
+    chegam a ser lidos do disco.
+    """
+    import geopandas as gpd
+    
+    return gpd.read_parquet(caminho, bbox=bbox)
+
+def bbox_grupos_parquet(caminho):
+    """Retorna o bbox de cada row group gravado por `salvar_parquet_espacial`."""
+    import pandas as pd
+    import pyarrow.parquet as pq
+    
+    metadados = pq.ParquetFile(caminho).metadata
+    colunas = {metadados.schema.column(i).path: i for i in range(metadados.num_columns)}
+    
+    linhas = []
+    for grupo in range(metadados.num_row_groups):
+        rg = metadados.row_group(grupo)
+        stats = {nome: rg.column(colunas[f'bbox.{nome}']).statistics
+                 for nome in ('xmin', 'ymin', 'xmax', 'ymax')}
+        linhas.append({
+            'grupo': grupo,
+            'linhas': rg.num_rows,
+            'xmin': stats['xmin'].min,
+            'ymin': stats['ymin'].min,
+            'xmax': stats['xmax'].max,
+            'ymax': stats['ymax'].max,
+        })
+    
+    return pd.DataFrame(linhas)
+
 # =============================================================================
 # EXPORTAÇÃO DE DADOS
 # =============================================================================
 
-def salvar_dados(gdf):
-    """Salva os dados em diferentes formatos."""
+def _colunas_atributos(gdf, inicio, fim):
+    """Fatia das colunas não geométricas, sem copiar o GeoDataFrame inteiro."""
+    import pandas as pd
+    
+    nome_geometria = gdf.geometry.name
+    return pd.DataFrame({
+        coluna: gdf[coluna].iloc[inicio:fim]
+        for coluna in gdf.columns if coluna != nome_geometria
+    })
+
+def salvar_csv_coordenadas(gdf, caminho, modo='xy', precisao=None, linhas_por_bloco=100000):
+    """Salva em CSV sem a cópia defensiva do GeoDataFrame.
+    
+    As colunas de atributos são escritas em blocos de `linhas_por_bloco`
+    linhas, de modo que a memória extra fica limitada ao tamanho do bloco.
+    
+    Modos de codificação da geometria:
+        'xy': colunas `longitude`/`latitude` (apenas pontos), arredondadas
+            para `precisao` casas decimais quando informada. Pontos vazios ou
+            ausentes ficam com NaN, como em `.geometry.x/.y`.
+        'wkb': coluna `geometry_wkb` com o WKB em hexadecimal (qualquer tipo
+            de geometria, sem perda de precisão).
+        'delta': colunas inteiras `dx_e<precisao>`/`dy_e<precisao>` (ex.:
+            `dx_e6`) com a diferença, na escala de 10^`precisao` (padrão 6), em
+            relação ao ponto anterior; a escala fica registrada no nome da
+            coluna. Combine com `ordenar_espacialmente` para deltas pequenos;
+            decodifique com `decodificar_delta`. Pontos vazios ou ausentes
+            ficam com dx/dy em branco e não alteram a referência do ponto
+            seguinte.
+    """
+    import numpy as np
+    import pandas as pd
+    import shapely
+    
+    if modo not in ('xy', 'wkb', 'delta'):
+        raise ValueError(f"Modo de CSV desconhecido: {modo!r} (use 'xy', 'wkb' ou 'delta')")
+    if modo == 'delta':
+        precisao = 6 if precisao is None else precisao
+        if precisao < 0 or int(precisao) != precisao:
+            raise ValueError(f"No modo 'delta', precisao deve ser um inteiro >= 0, recebido: {precisao!r}")
+        precisao = int(precisao)
+    
+    geometria = gdf.geometry.array
+    # Tipo -1 é geometria ausente (None), aceita junto com os pontos
+    if modo in ('xy', 'delta') and not np.isin(shapely.get_type_id(geometria), (-1, 0)).all():
+        raise ValueError(f"O modo {modo!r} aceita apenas geometrias do tipo Point")
+    
+    anterior = np.zeros(2, dtype=np.int64)
+    with open(caminho, 'w', newline='', encoding='utf-8') as arquivo:
+        for inicio in range(0, max(len(gdf), 1), linhas_por_bloco):
+            fim = inicio + linhas_por_bloco
+            bloco = _colunas_atributos(gdf, inicio, fim)
+            
+            if modo == 'wkb':
+                bloco['geometry_wkb'] = shapely.to_wkb(geometria[inicio:fim], hex=True)
+            else:
+                # Pontos vazios ou ausentes viram NaN, como em `.geometry.x/.y`
+                pontos = np.asarray(geometria[inicio:fim])
+                presentes = ~(shapely.is_missing(pontos) | shapely.is_empty(pontos))
+                xy = np.full((len(pontos), 2), np.nan)
+                xy[presentes, 0] = shapely.get_x(pontos[presentes])
+                xy[presentes, 1] = shapely.get_y(pontos[presentes])
+                if modo == 'xy':
+                    if precisao is not None:
+                        xy = np.round(xy, precisao)
+                    bloco['longitude'], bloco['latitude'] = xy[:, 0], xy[:, 1]
+                else:
+                    validos = ~np.isnan(xy).any(axis=1)
+                    inteiros = np.round(xy[validos] * 10 ** precisao).astype(np.int64)
+                    deltas = np.diff(inteiros, axis=0, prepend=anterior[np.newaxis])
+                    if len(inteiros):
+                        anterior = inteiros[-1]
+                    for eixo, coluna in enumerate((f'dx_e{precisao}', f'dy_e{precisao}')):
+                        valores = pd.array([pd.NA] * len(xy), dtype='Int64')
+                        valores[validos] = deltas[:, eixo]
+                        bloco[coluna] = valores
+            
+            bloco.to_csv(arquivo, index=False, header=inicio == 0)
+
+def decodificar_delta(df, crs=None):
+    """Reconstrói o GeoDataFrame de pontos a partir de um CSV no modo 'delta'.
+    
+    A escala é lida dos nomes das colunas `dx_e<precisao>`/`dy_e<precisao>`.
+    Linhas com dx/dy em branco voltam como geometria ausente (None).
+    """
+    import re
+    import geopandas as gpd
+    import numpy as np
+    
+    escalas = {'x': set(), 'y': set()}
+    for coluna in df.columns:
+        encontrado = re.fullmatch(r'd([xy])_e(\d+)', str(coluna))
+        if encontrado:
+            escalas[encontrado.group(1)].add(int(encontrado.group(2)))
+    if len(escalas['x']) != 1 or escalas['x'] != escalas['y']:
+        raise ValueError("Esperado um par de colunas dx_e<precisao>/dy_e<precisao> com a mesma escala")
+    precisao = escalas['x'].pop()
+    colunas = [f'dx_e{precisao}', f'dy_e{precisao}']
+    
+    deltas = df[colunas].to_numpy(dtype=float, na_value=np.nan)
+    validos = ~np.isnan(deltas).any(axis=1)
+    xy = np.cumsum(deltas[validos].astype(np.int64), axis=0) / 10 ** precisao
+    
+    geometria = np.full(len(df), None, dtype=object)
+    geometria[validos] = gpd.points_from_xy(xy[:, 0], xy[:, 1])
+    return gpd.GeoDataFrame(df.drop(columns=colunas), geometry=geometria, crs=crs)
+
+def salvar_geojson(gdf, caminho, precisao=None):
+    """Salva em GeoJSON, limitando as coordenadas a `precisao` casas decimais."""
+    opcoes = {} if precisao is None else {'COORDINATE_PRECISION': precisao}
+    gdf.to_file(caminho, driver='GeoJSON', **opcoes)
+
+def _csv_com_copia(gdf, caminho):
+    """Exportação CSV original de `salvar_dados`, mantida como referência."""
+    gdf_csv = gdf.copy()
+    gdf_csv['longitude'] = gdf_csv.geometry.x
+    gdf_csv['latitude'] = gdf_csv.geometry.y
+    gdf_csv = gdf_csv.drop(columns=[gdf_csv.geometry.name])
+    gdf_csv.to_csv(caminho, index=False)
+
+def comparar_exportacoes(gdf, diretorio='.', precisao=6, repeticoes=3):
+    """Compara tamanho, vazão e pico de memória dos modos de exportação.
+    
+    Os escritores originais (CSV com `copy()` e GeoJSON em precisão total)
+    entram como linha de base. O tempo é o melhor de `repeticoes` execuções;
+    o pico de memória é medido numa execução separada com `tracemalloc`.
+    
+    Returns:
+        DataFrame com KB, segundos, linhas por segundo e pico de memória (MB)
+        de cada formato.
+    """
+    import os
+    import tracemalloc
+    import pandas as pd
+    
+    diretorio = Path(diretorio)
+    escritores = {
+        'csv (original, copy)': ('exportacao_original.csv', lambda c: _csv_com_copia(gdf, c)),
+        'csv xy': ('exportacao_xy.csv', lambda c: salvar_csv_coordenadas(gdf, c, precisao=precisao)),
+        'csv wkb hex': ('exportacao_wkb.csv', lambda c: salvar_csv_coordenadas(gdf, c, modo='wkb')),
+        'csv delta': ('exportacao_delta.csv', lambda c: salvar_csv_coordenadas(gdf, c, modo='delta', precisao=precisao)),
+        'geojson (original)': ('exportacao_original.geojson', lambda c: salvar_geojson(gdf, c)),
+        'geojson precisao': ('exportacao_precisao.geojson', lambda c: salvar_geojson(gdf, c, precisao=precisao)),
+    }
+    
+    linhas = []
+    for formato, (arquivo, escrever) in escritores.items():
+        caminho = diretorio / arquivo
+        tempos = []
+        for _ in range(repeticoes):
+            inicio = time.perf_counter()
+            escrever(caminho)
+            tempos.append(time.perf_counter() - inicio)
+        
+        tracemalloc.start()
+        escrever(caminho)
+        _, pico = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        
+        linhas.append({
+            'formato': formato,
+            'kb': os.path.getsize(caminho) / 1024,
+            'segundos': min(tempos),
+            'linhas_por_segundo': len(gdf) / min(tempos),
+            'pico_memoria_mb': pico / 1024 ** 2,
+        })
+    
+    return pd.DataFrame(linhas).set_index('formato')
+
+def salvar_dados(gdf, precisao=None, modo_csv='xy'):
+    """Salva os dados em diferentes formatos.
+    
+    Args:
+        gdf: GeoDataFrame a ser exportado.
+        precisao: Casas decimais das coordenadas no GeoJSON e no CSV
+            (None mantém a precisão total).
+        modo_csv: Codificação da geometria no CSV ('xy', 'wkb' ou 'delta'),
+            veja `salvar_csv_coordenadas`.
+    """
     print("💾 SALVANDO DADOS:")
     print("=" * 20)
     
     try:
         # 1. GeoJSON (formato web-friendly)
-        gdf.to_file('cidades_exemplo.geojson', driver='GeoJSON')
+        salvar_geojson(gdf, 'cidades_exemplo.geojson', precisao=precisao)
         print("✅ Dados salvos em GeoJSON")
         
         # 2. Shapefile (formato padrão GIS)
         gdf.to_file('cidades_exemplo.shp', driver='ESRI Shapefile')
         print("✅ Dados salvos em Shapefile")
         
-        # 3. CSV com coordenadas separadas
-        cidades_csv = gdf.copy()
-        cidades_csv['longitude'] = cidades_csv.geometry.x
-        cidades_csv['latitude'] = cidades_csv.geometry.y
-        cidades_csv = cidades_csv.drop(columns=['geometry'])
-        cidades_csv.to_csv('cidades_exemplo.csv', index=False)
+        # 3. CSV com coordenadas (sem copiar o GeoDataFrame)
+        salvar_csv_coordenadas(gdf, 'cidades_exemplo.csv', modo=modo_csv, precisao=precisao)
         print("✅ Dados salvos em CSV")
         
         # 4. Parquet (formato eficiente para grandes datasets)
-        gdf.to_parquet('cidades_exemplo.parquet')
+        # Ordenado pela curva de Hilbert e com bbox por row group
+        salvar_parquet_espacial(gdf, 'cidades_exemplo.parquet')
         print("✅ Dados salvos em Parquet")
         
     except Exception as e:
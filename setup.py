@@ -32,13 +32,15 @@ def instalar_dependencias():
         
         # Instalando GeoPandas e dependências
         dependencias = [
-            "geopandas>=0.13.0",
+            "geopandas>=1.0.0",
             "pandas>=1.3.0",
             "numpy>=1.21.0",
             "matplotlib>=3.5.0",
             "shapely>=1.8.0",
             "pyproj>=3.0.0",
-            "fiona>=1.8.0"
+            "fiona>=1.8.0",
+            "pyarrow>=8.0.0",
+            "openpyxl>=3.0.0"
         ]
         
         for dep in dependencias: